@@ -1,4 +1,5 @@
 from dotenv import load_dotenv
+from fractions import Fraction
 import requests
 import logging
 import json
@@ -85,6 +86,9 @@ class ConfigValidator:
         await self.validate_token1(self.config_data["token1"])
         await self.validate_token2(self.config_data["token2"])
 
+        self.config_data.setdefault("alerts", [])
+        await self.validate_alerts(self.config_data["alerts"])
+
         return self.config_data
 
     async def validate_required_keys(self):
@@ -123,6 +127,75 @@ class ConfigValidator:
             logging.error("❗️ Ошибка: Неподдерживаемый токен! Введите один из поддерживаемых токенов.")
             exit(1)
 
+    @staticmethod
+    async def validate_alerts(alerts: list) -> None:
+        """Валидация списка алертов"""
+        common = {"type", "name", "once"}
+        alert_fields = {
+            "tick_cross": ({"tick"}, {"direction"}),
+            "price_cross": ({"price", "decimals0", "decimals1"}, {"direction"}),
+            "amount_above": ({"field", "amount"}, set()),
+            "tick_range_exit": ({"tick_lower", "tick_upper"}, set()),
+        }
+
+        if not isinstance(alerts, list):
+            logging.error("❗️ Ошибка: 'alerts' должен быть списком.")
+            exit(1)
+
+        for alert in alerts:
+            if not isinstance(alert, dict) or alert.get("type") not in alert_fields:
+                logging.error(f"❗️ Ошибка: Неподдерживаемый алерт {alert}! "
+                              f"Допустимые типы: {list(alert_fields)}.")
+                exit(1)
+
+            required, optional = alert_fields[alert["type"]]
+            missing = required - alert.keys()
+            if missing:
+                logging.error(f"❗️ Ошибка: В алерте {alert} отсутствуют поля {sorted(missing)}.")
+                exit(1)
+
+            unknown = alert.keys() - required - optional - common
+            if unknown:
+                logging.error(f"❗️ Ошибка: В алерте {alert} неизвестные поля {sorted(unknown)}.")
+                exit(1)
+
+            for key in ("tick", "tick_lower", "tick_upper", "amount", "decimals0", "decimals1"):
+                if key in alert and (not isinstance(alert[key], int) or isinstance(alert[key], bool)):
+                    logging.error(f"❗️ Ошибка: В алерте {alert} поле '{key}' должно быть целым числом.")
+                    exit(1)
+
+            if "once" in alert and not isinstance(alert["once"], bool):
+                logging.error(f"❗️ Ошибка: В алерте {alert} поле 'once' должно быть true или false.")
+                exit(1)
+
+            if "name" in alert and not isinstance(alert["name"], str):
+                logging.error(f"❗️ Ошибка: В алерте {alert} поле 'name' должно быть строкой.")
+                exit(1)
+
+            if alert.get("direction", "both") not in ("up", "down", "both"):
+                logging.error(f"❗️ Ошибка: В алерте {alert} 'direction' должен быть up, down или both.")
+                exit(1)
+
+            if alert["type"] == "amount_above" and alert["field"] not in ("amount0", "amount1"):
+                logging.error(f"❗️ Ошибка: В алерте {alert} 'field' должен быть amount0 или amount1.")
+                exit(1)
+
+            if alert["type"] == "tick_range_exit" and alert["tick_lower"] >= alert["tick_upper"]:
+                logging.error(f"❗️ Ошибка: В алерте {alert} 'tick_lower' должен быть меньше 'tick_upper'.")
+                exit(1)
+
+            if alert["type"] == "price_cross":
+                price = alert["price"]
+                try:
+                    if isinstance(price, bool) or not isinstance(price, (int, float, str)):
+                        raise ValueError(price)
+                    positive = Fraction(str(price)) > 0
+                except (ValueError, ZeroDivisionError):
+                    positive = False
+                if not positive:
+                    logging.error(f"❗️ Ошибка: В алерте {alert} 'price' должен быть положительным числом.")
+                    exit(1)
+
     @staticmethod
     async def validate_network(network: str) -> None:
         """Валидация названия сети"""
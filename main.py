@@ -2,6 +2,7 @@ from config.configvalidator import ConfigValidator
 from client.client import Client
 from utils.logger import logger
 from modules.monitor import listen_to_swaps
+from modules.alerts import build_alert_engine
 import asyncio
 import json
 
@@ -29,9 +30,13 @@ async def main():
             explorer_url=network["explorer_url"]
         )
 
+        # Регистрация алертов
+        alert_engine = build_alert_engine(settings["alerts"])
+        logger.info(f"🔔 Зарегистрировано алертов: {len(alert_engine)}\n")
+
         # Запуск мониторинга
         logger.info("⚙️ Запускаем мониторинг...\n")
-        await listen_to_swaps(client)
+        await listen_to_swaps(client, alert_engine)
         logger.info("⚙️ Завершение работы...\n")
     except Exception as e:
         logger.error(f"Произошла ошибка в основном пути: {e}")
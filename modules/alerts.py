@@ -0,0 +1,367 @@
+from bisect import bisect_left, bisect_right, insort
+from fractions import Fraction
+from itertools import count
+from typing import Awaitable, Callable, Optional, Union
+from utils.logger import logger
+import asyncio
+import inspect
+import math
+
+Q96 = 2 ** 96
+
+AlertCallback = Callable[["AlertRule", dict], Union[None, Awaitable[None]]]
+
+
+class AlertRule:
+    """Пользовательское правило, срабатывающее на декодированный Swap"""
+
+    def __init__(self, rule_id: int, kind: str, name: str, callback: AlertCallback, once: bool):
+        self.rule_id = rule_id
+        self.kind = kind
+        self.name = name
+        self.callback = callback
+        self.once = once
+        # Ключи (индекс, (порог, rule_id)), под которыми правило лежит в индексах движка
+        self.entries: list = []
+
+    def __repr__(self) -> str:
+        return f"AlertRule(id={self.rule_id}, kind={self.kind}, name={self.name!r})"
+
+
+class _ThresholdIndex:
+    """
+    Отсортированный массив порогов с поиском через bisect.
+
+    Удалённые записи остаются в массиве до уплотнения и пропускаются при
+    поиске, поэтому удаление сработавших правил из match() не сдвигает список.
+    """
+
+    def __init__(self):
+        self.keys: list = []
+        self.rules: dict = {}
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def add(self, threshold: int, rule: AlertRule) -> tuple:
+        self.compact()
+        key = (threshold, rule.rule_id)
+        insort(self.keys, key)
+        self.rules[rule.rule_id] = rule
+        return key
+
+    def remove(self, key: tuple) -> None:
+        self.rules.pop(key[1], None)
+        # Уплотняем, когда удалённых больше, чем живых: амортизированно O(1) на удаление
+        if len(self.keys) > 2 * len(self.rules):
+            self.compact()
+
+    def compact(self) -> None:
+        if len(self.keys) != len(self.rules):
+            self.keys = [key for key in self.keys if key[1] in self.rules]
+
+    def _alive(self, keys: list) -> list:
+        return [self.rules[rule_id] for _, rule_id in keys if rule_id in self.rules]
+
+    def crossed(self, prev: int, cur: int) -> list:
+        """Правила с порогом X в полуинтервале (min, max] между prev и cur"""
+        low, high = (prev, cur) if prev <= cur else (cur, prev)
+        lo = bisect_right(self.keys, (low, math.inf))
+        hi = bisect_right(self.keys, (high, math.inf))
+        return self._alive(self.keys[lo:hi])
+
+    def below(self, value: int) -> list:
+        """Правила с порогом строго меньше value"""
+        hi = bisect_left(self.keys, (value, -math.inf))
+        return self._alive(self.keys[:hi])
+
+
+class _RangeExitIndex:
+    """
+    Границы диапазонов для выхода в одну сторону.
+
+    Записи (граница, rule_id, условие) отсортированы по границе, поверх них
+    построено дерево отрезков с минимумом условия. Диапазоны, через которые
+    тик перескочил целиком, отсекаются на уровне поддеревьев и не перебираются.
+    """
+
+    def __init__(self):
+        self.entries: list = []
+        self.rules: dict = {}
+        self._tree: list = []
+        self._size = 0
+        self._dead: set = set()
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def add(self, boundary: int, condition: int, rule: AlertRule) -> tuple:
+        self._compact()
+        entry = (boundary, rule.rule_id, condition)
+        insort(self.entries, entry)
+        self.rules[rule.rule_id] = rule
+        self._dirty = True
+        return entry
+
+    def remove(self, entry: tuple) -> None:
+        pos = bisect_left(self.entries, entry)
+        if pos >= len(self.entries) or self.entries[pos] != entry or pos in self._dead:
+            return
+        self.rules.pop(entry[1], None)
+        if self._dirty:
+            del self.entries[pos]
+            return
+        # Вне перестройки помечаем запись удалённой за O(log n)
+        self._dead.add(pos)
+        node = self._size + pos
+        self._tree[node] = math.inf
+        node //= 2
+        while node:
+            self._tree[node] = min(self._tree[2 * node], self._tree[2 * node + 1])
+            node //= 2
+
+    def _compact(self) -> None:
+        if self._dead:
+            self.entries = [e for i, e in enumerate(self.entries) if i not in self._dead]
+            self._dead.clear()
+            self._dirty = True
+
+    def freeze(self) -> None:
+        """Перестраивает дерево после добавлений, чтобы не делать этого в match()"""
+        if self._dirty or self._dead:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        self._compact()
+        size = 1
+        while size < len(self.entries):
+            size *= 2
+        tree = [math.inf] * (2 * size)
+        for i, entry in enumerate(self.entries):
+            tree[size + i] = entry[2]
+        for node in range(size - 1, 0, -1):
+            tree[node] = min(tree[2 * node], tree[2 * node + 1])
+        self._tree = tree
+        self._size = size
+        self._dirty = False
+
+    def _collect(self, node: int, left: int, right: int, lo: int, hi: int, bound: int, out: list) -> None:
+        if right <= lo or hi <= left or self._tree[node] > bound:
+            return
+        if right - left == 1:
+            out.append(self.rules[self.entries[left][1]])
+            return
+        mid = (left + right) // 2
+        self._collect(2 * node, left, mid, lo, hi, bound, out)
+        self._collect(2 * node + 1, mid, right, lo, hi, bound, out)
+
+    def crossed(self, prev: int, cur: int, bound: int) -> list:
+        """Правила с границей в (min, max] между prev и cur и условием не больше bound"""
+        if self._dirty:
+            self._rebuild()
+        if not self.rules:
+            return []
+        low, high = (prev, cur) if prev <= cur else (cur, prev)
+        lo = bisect_right(self.entries, (low, math.inf))
+        hi = bisect_right(self.entries, (high, math.inf))
+        out = []
+        self._collect(1, 0, self._size, lo, hi, bound, out)
+        return out
+
+
+class AlertEngine:
+    """
+    Индексированный движок алертов для потока декодированных Swap.
+
+    Пороги цены, тика и объёма хранятся в отсортированных массивах: на событие
+    выполняется O(log n) поиск плюс O(k) по k сработавшим правилам (удаление
+    сработавших once-правил амортизированно O(1)). Выходы из диапазонов ищутся
+    в дереве отрезков за O((k + 1) log n), перескоченные диапазоны не перебираются.
+
+    Регистрация правила стоит O(n). После добавления выходов из диапазонов
+    следует вызвать freeze(), иначе дерево перестроится за O(n) на следующем событии.
+    """
+
+    def __init__(self):
+        self._ids = count()
+        self._rules: dict = {}
+        # Пересечения по тику и sqrtPriceX96, отдельно для движения вверх и вниз
+        self._tick_up = _ThresholdIndex()
+        self._tick_down = _ThresholdIndex()
+        self._price_up = _ThresholdIndex()
+        self._price_down = _ThresholdIndex()
+        self._amounts = {"amount0": _ThresholdIndex(), "amount1": _ThresholdIndex()}
+        # Выход вверх: граница upper, условие lower <= prev.
+        # Выход вниз: граница lower, условие prev < upper, т.е. -upper <= -prev - 1
+        self._range_up = _RangeExitIndex()
+        self._range_down = _RangeExitIndex()
+        self._prev_tick: Optional[int] = None
+        self._prev_sqrt_price: Optional[int] = None
+        self._tasks: set = set()
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    @staticmethod
+    def price_to_sqrt_price_x96(price: Union[int, float, str], decimals0: int = 0, decimals1: int = 0) -> int:
+        """
+        Переводит цену token0 в token1 в sqrtPriceX96 с учётом децималов.
+
+        Цена берётся по её десятичной записи через Fraction, результат равен
+        floor(sqrt(price) * 2**96) без ошибок округления float.
+        """
+        raw_price = Fraction(str(price)) * Fraction(10) ** (decimals1 - decimals0)
+        if raw_price <= 0:
+            raise ValueError(f"❌ Цена должна быть положительной: {price}")
+        return math.isqrt(raw_price.numerator * Q96 * Q96 // raw_price.denominator)
+
+    def _new_rule(self, kind: str, name: Optional[str], callback: AlertCallback, once: bool) -> AlertRule:
+        rule_id = next(self._ids)
+        rule = AlertRule(rule_id, kind, name or f"{kind}#{rule_id}", callback, once)
+        self._rules[rule_id] = rule
+        return rule
+
+    def _index(self, rule: AlertRule, index: _ThresholdIndex, threshold: int) -> None:
+        rule.entries.append((index, index.add(threshold, rule)))
+
+    def _crossing_indexes(self, up: _ThresholdIndex, down: _ThresholdIndex, direction: str) -> list:
+        indexes = {"up": [up], "down": [down], "both": [up, down]}.get(direction)
+        if indexes is None:
+            raise ValueError(f"❌ Неизвестное направление: {direction}. Допустимо: up, down, both")
+        return indexes
+
+    def add_tick_cross(self, tick: int, callback: AlertCallback, direction: str = "both",
+                       name: Optional[str] = None, once: bool = False) -> AlertRule:
+        """Срабатывает, когда тик пула пересекает заданное значение"""
+        indexes = self._crossing_indexes(self._tick_up, self._tick_down, direction)
+        rule = self._new_rule("tick_cross", name, callback, once)
+        for index in indexes:
+            self._index(rule, index, tick)
+        return rule
+
+    def add_price_cross(self, price: Union[int, float, str], callback: AlertCallback, direction: str = "both",
+                        decimals0: int = 0, decimals1: int = 0,
+                        name: Optional[str] = None, once: bool = False) -> AlertRule:
+        """
+        Срабатывает, когда цена пула пересекает заданное значение.
+
+        decimals0 / decimals1 — децималы token0 / token1 пула; по умолчанию цена
+        задаётся в сырых единицах токенов.
+        """
+        indexes = self._crossing_indexes(self._price_up, self._price_down, direction)
+        threshold = self.price_to_sqrt_price_x96(price, decimals0, decimals1)
+        rule = self._new_rule("price_cross", name, callback, once)
+        for index in indexes:
+            self._index(rule, index, threshold)
+        return rule
+
+    def add_amount_above(self, field: str, amount: int, callback: AlertCallback,
+                         name: Optional[str] = None, once: bool = False) -> AlertRule:
+        """Срабатывает, когда |amount0| или |amount1| свопа строго больше порога"""
+        if field not in self._amounts:
+            raise ValueError(f"❌ Неизвестное поле: {field}. Допустимо: {list(self._amounts)}")
+        rule = self._new_rule("amount_above", name, callback, once)
+        self._index(rule, self._amounts[field], abs(amount))
+        return rule
+
+    def add_tick_range_exit(self, tick_lower: int, tick_upper: int, callback: AlertCallback,
+                            name: Optional[str] = None, once: bool = False) -> AlertRule:
+        """
+        Срабатывает, когда тик выходит из диапазона [tick_lower, tick_upper).
+
+        Дерево диапазонов перестраивается в freeze() или на следующем событии.
+        """
+        if tick_lower >= tick_upper:
+            raise ValueError(f"❌ Некорректный диапазон тиков: [{tick_lower}, {tick_upper})")
+        rule = self._new_rule("tick_range_exit", name, callback, once)
+        rule.entries.append((self._range_up, self._range_up.add(tick_upper, tick_lower, rule)))
+        rule.entries.append((self._range_down, self._range_down.add(tick_lower, -tick_upper, rule)))
+        return rule
+
+    def freeze(self) -> None:
+        """Уплотняет индексы и перестраивает деревья диапазонов после пакета добавлений"""
+        for index in (self._tick_up, self._tick_down, self._price_up, self._price_down, *self._amounts.values()):
+            index.compact()
+        self._range_up.freeze()
+        self._range_down.freeze()
+
+    def remove(self, rule: AlertRule) -> None:
+        if self._rules.pop(rule.rule_id, None) is None:
+            return
+        for index, key in rule.entries:
+            index.remove(key)
+        rule.entries.clear()
+
+    def _crossings(self, up: _ThresholdIndex, down: _ThresholdIndex, prev: Optional[int], cur: int) -> list:
+        if prev is None or prev == cur:
+            return []
+        return up.crossed(prev, cur) if cur > prev else down.crossed(prev, cur)
+
+    def match(self, event: dict) -> list:
+        """Возвращает правила, сработавшие на событие, и обновляет состояние пула"""
+        tick = event["tick"]
+        sqrt_price = event["sqrtPriceX96"]
+        prev_tick = self._prev_tick
+
+        fired = self._crossings(self._tick_up, self._tick_down, prev_tick, tick)
+        if prev_tick is not None and tick > prev_tick:
+            fired.extend(self._range_up.crossed(prev_tick, tick, prev_tick))
+        elif prev_tick is not None and tick < prev_tick:
+            fired.extend(self._range_down.crossed(prev_tick, tick, -prev_tick - 1))
+        fired.extend(self._crossings(self._price_up, self._price_down, self._prev_sqrt_price, sqrt_price))
+        for field, index in self._amounts.items():
+            if index:
+                fired.extend(index.below(abs(event[field])))
+
+        self._prev_tick = tick
+        self._prev_sqrt_price = sqrt_price
+
+        for rule in fired:
+            if rule.once:
+                self.remove(rule)
+        return fired
+
+    async def _run(self, rule: AlertRule, event: dict) -> None:
+        try:
+            result = rule.callback(rule, event)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.error(f"❌ Ошибка в обработчике алерта {rule.name}: {e}")
+
+    def process(self, event: dict) -> list:
+        """Находит сработавшие правила и запускает их обработчики в фоне"""
+        fired = self.match(event)
+        for rule in fired:
+            task = asyncio.create_task(self._run(rule, event))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return fired
+
+
+async def log_alert(rule: AlertRule, event: dict) -> None:
+    logger.info(
+        f"🔔 Алерт {rule.name}: tick={event['tick']}, sqrtPriceX96={event['sqrtPriceX96']}, "
+        f"amount0={event['amount0']}, amount1={event['amount1']}\n"
+    )
+
+
+def build_alert_engine(alerts: list, callback: AlertCallback = log_alert) -> AlertEngine:
+    """Создаёт движок и регистрирует правила из секции 'alerts' в settings.json"""
+    engine = AlertEngine()
+    for alert in alerts:
+        params = dict(alert)
+        kind = params.pop("type")
+        if kind == "tick_cross":
+            engine.add_tick_cross(callback=callback, **params)
+        elif kind == "price_cross":
+            engine.add_price_cross(callback=callback, **params)
+        elif kind == "amount_above":
+            engine.add_amount_above(callback=callback, **params)
+        elif kind == "tick_range_exit":
+            engine.add_tick_range_exit(callback=callback, **params)
+        else:
+            raise ValueError(f"❌ Неизвестный тип алерта: {kind}")
+    engine.freeze()
+    return engine
@@ -1,6 +1,8 @@
 import aiohttp
 from eth_abi import decode_abi
 from modules.get_pool import get_uniswap_v3_pool
+from modules.alerts import AlertEngine
+from typing import Optional
 import json
 from eth_utils import to_checksum_address, decode_hex
 
@@ -35,7 +37,7 @@ def decode_swap_event(log: dict, swap_topic) -> dict:
     }
 
 
-async def listen_to_swaps(client):
+async def listen_to_swaps(client, alert_engine: Optional[AlertEngine] = None):
     swap_topic = "0xc42079f94a6350d7e6235f29174924f928cc2ac818eb64fed8004e115fbcca67"
     pool = await get_uniswap_v3_pool(client)
 
@@ -70,6 +72,13 @@ async def listen_to_swaps(client):
                             print()
                         except Exception as e:
                             print(f"⚠️ Ошибка декодирования: {e}")
+                            continue
+
+                        if alert_engine is not None:
+                            try:
+                                alert_engine.process(decoded)
+                            except Exception as e:
+                                print(f"⚠️ Ошибка движка алертов: {e}")
                 elif msg.type == aiohttp.WSMsgType.ERROR:
                     print(f"❌ WebSocket ошибка: {msg.data}")
                     break
@@ -0,0 +1,180 @@
+import asyncio
+import math
+
+import pytest
+
+from modules.alerts import AlertEngine, Q96
+
+
+def noop(rule, event):
+    pass
+
+
+def swap(tick: int, sqrt_price: int = Q96, amount0: int = 0, amount1: int = 0) -> dict:
+    return {"tick": tick, "sqrtPriceX96": sqrt_price, "amount0": amount0, "amount1": amount1}
+
+
+def names(rules: list) -> list:
+    return sorted(rule.name for rule in rules)
+
+
+def test_first_event_has_no_crossings():
+    engine = AlertEngine()
+    engine.add_tick_cross(0, noop, name="t0")
+    assert engine.match(swap(10)) == []
+
+
+def test_tick_cross_up_fires_exactly_at_threshold():
+    engine = AlertEngine()
+    engine.add_tick_cross(100, noop, name="t100")
+    engine.match(swap(99))
+    assert names(engine.match(swap(100))) == ["t100"]
+
+
+def test_tick_cross_down_fires_only_below_threshold():
+    engine = AlertEngine()
+    engine.add_tick_cross(100, noop, name="t100")
+    engine.match(swap(101))
+    # Полуинтервал (min, max]: спуск до самого порога ещё не пересечение
+    assert engine.match(swap(100)) == []
+    assert names(engine.match(swap(99))) == ["t100"]
+
+
+def test_tick_cross_direction():
+    engine = AlertEngine()
+    engine.add_tick_cross(100, noop, direction="up", name="up")
+    engine.add_tick_cross(100, noop, direction="down", name="down")
+    engine.add_tick_cross(100, noop, name="both")
+    engine.match(swap(50))
+    assert names(engine.match(swap(150))) == ["both", "up"]
+    assert names(engine.match(swap(50))) == ["both", "down"]
+
+
+def test_unknown_direction_rejected():
+    with pytest.raises(ValueError):
+        AlertEngine().add_tick_cross(0, noop, direction="sideways")
+
+
+def test_price_cross_uses_sqrt_price():
+    engine = AlertEngine()
+    engine.add_price_cross(4, noop, name="p4")
+    engine.match(swap(0, sqrt_price=Q96))
+    assert names(engine.match(swap(0, sqrt_price=2 * Q96))) == ["p4"]
+
+
+def test_price_to_sqrt_price_x96_is_exact():
+    assert AlertEngine.price_to_sqrt_price_x96(1) == Q96
+    assert AlertEngine.price_to_sqrt_price_x96("0.25") == Q96 // 2
+    assert AlertEngine.price_to_sqrt_price_x96(2) == math.isqrt(2 * Q96 * Q96)
+    assert AlertEngine.price_to_sqrt_price_x96(1, decimals0=6, decimals1=8) == 10 * Q96
+
+
+def test_amount_above_is_strict():
+    engine = AlertEngine()
+    engine.add_amount_above("amount0", 10, noop, name="a0")
+    engine.add_amount_above("amount1", -5, noop, name="a1")
+    assert engine.match(swap(0, amount0=10)) == []
+    assert names(engine.match(swap(0, amount0=-11))) == ["a0"]
+    assert names(engine.match(swap(0, amount1=6))) == ["a1"]
+
+
+def test_range_exit_through_upper():
+    engine = AlertEngine()
+    engine.add_tick_range_exit(0, 10, noop, name="r")
+    engine.match(swap(5))
+    assert engine.match(swap(9)) == []
+    assert names(engine.match(swap(10))) == ["r"]
+
+
+def test_range_exit_through_lower():
+    engine = AlertEngine()
+    engine.add_tick_range_exit(0, 10, noop, name="r")
+    engine.match(swap(5))
+    assert engine.match(swap(0)) == []
+    assert names(engine.match(swap(-1))) == ["r"]
+
+
+def test_range_jumped_over_does_not_fire():
+    engine = AlertEngine()
+    engine.add_tick_range_exit(0, 10, noop, name="r")
+    engine.match(swap(-5))
+    assert engine.match(swap(20)) == []
+    assert engine.match(swap(-20)) == []
+
+
+def test_range_entry_does_not_fire():
+    engine = AlertEngine()
+    engine.add_tick_range_exit(0, 10, noop, name="r")
+    engine.match(swap(-5))
+    assert engine.match(swap(5)) == []
+
+
+def test_invalid_range_rejected():
+    with pytest.raises(ValueError):
+        AlertEngine().add_tick_range_exit(10, 10, noop)
+
+
+def test_once_rule_removed_after_firing():
+    engine = AlertEngine()
+    engine.add_tick_cross(100, noop, name="once", once=True)
+    engine.add_tick_range_exit(0, 10, noop, name="range_once", once=True)
+    engine.match(swap(5))
+    assert names(engine.match(swap(150))) == ["once", "range_once"]
+    assert len(engine) == 0
+    engine.match(swap(5))
+    assert engine.match(swap(150)) == []
+
+
+def test_remove():
+    engine = AlertEngine()
+    tick_rule = engine.add_tick_cross(100, noop, name="t")
+    range_rule = engine.add_tick_range_exit(0, 10, noop, name="r")
+    amount_rule = engine.add_amount_above("amount0", 1, noop, name="a")
+    engine.match(swap(5))
+    for rule in (tick_rule, range_rule, amount_rule):
+        engine.remove(rule)
+    assert len(engine) == 0
+    assert engine.match(swap(150, amount0=100)) == []
+
+
+def test_process_runs_sync_and_async_callbacks():
+    calls = []
+
+    def on_sync(rule, event):
+        calls.append(("sync", event["tick"]))
+
+    async def on_async(rule, event):
+        calls.append(("async", event["tick"]))
+
+    async def run():
+        engine = AlertEngine()
+        engine.add_amount_above("amount0", 0, on_sync)
+        engine.add_amount_above("amount0", 0, on_async)
+        engine.process(swap(7, amount0=1))
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert sorted(calls) == [("async", 7), ("sync", 7)]
+
+
+def test_once_rules_are_tombstoned_until_compaction():
+    engine = AlertEngine()
+    for i in range(4):
+        engine.add_amount_above("amount0", i, noop, once=True)
+    engine.add_amount_above("amount0", 100, noop, name="keep")
+    index = engine._amounts["amount0"]
+    assert len(engine.match(swap(0, amount0=2))) == 2
+    # Сработавшие правила только помечены удалёнными, список не сдвигался
+    assert len(index.keys) == 5 and len(index) == 3
+    assert len(engine.match(swap(0, amount0=2))) == 0
+    engine.freeze()
+    assert len(index.keys) == 3
+
+
+def test_freeze_rebuilds_range_index_outside_match():
+    engine = AlertEngine()
+    engine.add_tick_range_exit(0, 10, noop, name="r")
+    engine.freeze()
+    assert not engine._range_up._dirty and not engine._range_down._dirty
+    engine.match(swap(5))
+    assert names(engine.match(swap(10))) == ["r"]